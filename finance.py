@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""Financial metrics for the solar estimator.
+
+Every function accepts scalars or NumPy arrays and broadcasts, so the same
+code prices one household on a rerun or a whole batch of cash-flow series
+in a single call. Cash-flow arrays keep time on the last axis, with index 0
+being the upfront (year 0) flow.
+"""
+import numpy as np
+
+# --- Cost Model ---
+COST_PER_KW = 50000      # ₹ per installed kW (panels, inverter, BOS, labour)
+AREA_PER_KW = 10         # sq. meters of roof per kW
+PROJECTION_YEARS = 25
+
+
+def system_cost(required_kw, cost_per_kw=COST_PER_KW, subsidy=0.0):
+    """Net upfront cost after a flat capital subsidy (never below zero)."""
+    gross = np.asarray(required_kw, dtype=float) * cost_per_kw
+    return np.maximum(gross - subsidy, 0.0)
+
+
+def annual_savings(annual_units, grid_rate, inflation_pct, degradation_pct,
+                   years=PROJECTION_YEARS):
+    """Grid bill avoided in each of years 1..N, shape (..., years).
+
+    Generation degrades every year while the grid tariff escalates.
+    """
+    t = np.arange(years)
+    growth = (1 + np.asarray(inflation_pct, dtype=float)[..., None] / 100) ** t
+    decay = (1 - np.asarray(degradation_pct, dtype=float)[..., None] / 100) ** t
+    base = np.asarray(annual_units, dtype=float) * np.asarray(grid_rate, dtype=float)
+    return base[..., None] * growth * decay
+
+
+# --- Loan Financing ---
+def emi(principal, interest_pct, tenure_years):
+    """Equated monthly instalment for a reducing-balance loan."""
+    principal = np.asarray(principal, dtype=float)
+    r = np.asarray(interest_pct, dtype=float) / 1200
+    n = np.asarray(tenure_years, dtype=float) * 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = (1 + r) ** n
+        payment = principal * r * factor / (factor - 1)
+        flat = principal / n
+    payment = np.where(r == 0, flat, payment)
+    return np.where(n > 0, payment, 0.0)
+
+
+def total_interest(principal, interest_pct, tenure_years):
+    """Interest paid over the life of the loan."""
+    n = np.asarray(tenure_years, dtype=float) * 12
+    return emi(principal, interest_pct, tenure_years) * n - np.asarray(principal, dtype=float)
+
+
+def project_cash_flows(net_cost, savings, om_per_year=0.0, loan_fraction=0.0,
+                       interest_pct=0.0, tenure_years=0, yearly_costs=0.0):
+    """Owner's cash flows, shape (..., years + 1).
+
+    Year 0 is the down payment; years 1..N are the bill savings less O&M,
+    any per-year costs (shape (..., years), e.g. component replacements)
+    and any loan instalments still running that year.
+    """
+    net_cost = np.asarray(net_cost, dtype=float)
+    savings = np.asarray(savings, dtype=float)
+    loan_fraction = np.clip(np.asarray(loan_fraction, dtype=float), 0.0, 1.0)
+    principal = net_cost * loan_fraction
+
+    years = np.arange(1, savings.shape[-1] + 1)
+    tenure = np.asarray(tenure_years, dtype=float)[..., None]
+    loan_payments = (emi(principal, interest_pct, tenure_years) * 12)[..., None] * (years <= tenure)
+
+    yearly = (savings - np.asarray(om_per_year, dtype=float)[..., None]
+              - np.asarray(yearly_costs, dtype=float) - loan_payments)
+    upfront = -(net_cost - principal)
+    batch = np.broadcast_shapes(upfront.shape, yearly.shape[:-1])
+    upfront = np.broadcast_to(upfront[..., None], batch + (1,))
+    yearly = np.broadcast_to(yearly, batch + yearly.shape[-1:])
+    return np.concatenate([upfront, yearly], axis=-1)
+
+
+# --- Discounted Metrics ---
+def _discount_factors(rate, periods):
+    rate = np.asarray(rate, dtype=float)[..., None]
+    return (1 + rate) ** -np.arange(periods, dtype=float)
+
+
+def npv(rate, cash_flows):
+    """Net present value of cash flows discounted at `rate` (fraction)."""
+    cf = np.asarray(cash_flows, dtype=float)
+    return (cf * _discount_factors(rate, cf.shape[-1])).sum(axis=-1)
+
+
+def irr(cash_flows, guess=0.1, low=-0.99, high=10.0, tol=1e-7, max_iter=100):
+    """Internal rate of return for one or many cash-flow series.
+
+    Newton's method is safeguarded by a bisection bracket, so every series
+    in the batch converges without a Python-level loop over rows; rows that
+    have converged drop out of later iterations. Series with no sign change
+    in NPV across [low, high] return NaN.
+    """
+    cf = np.asarray(cash_flows, dtype=float)
+    batch = cf.shape[:-1]
+    cf = cf.reshape(-1, cf.shape[-1])
+    t = np.arange(cf.shape[-1], dtype=float)
+
+    def value_and_slope(r, rows):
+        disc = (1 + r)[:, None] ** -t
+        value = (rows * disc).sum(axis=-1)
+        slope = -(rows * t * disc).sum(axis=-1) / (1 + r)
+        return value, slope
+
+    lo = np.full(len(cf), low)
+    hi = np.full(len(cf), high)
+    f_lo, _ = value_and_slope(lo, cf)
+    f_hi, _ = value_and_slope(hi, cf)
+    # A root needs a genuine sign change, or a zero at exactly one end;
+    # series that are zero at both ends (e.g. all-zero flows) have no IRR
+    valid = (f_lo * f_hi < 0) | ((f_lo == 0) != (f_hi == 0))
+
+    result = np.full(len(cf), np.nan)
+    active = np.flatnonzero(valid)
+    r = np.where(f_lo[active] == 0, low, np.where(f_hi[active] == 0, high, float(np.clip(guess, low, high))))
+    lo, hi, f_lo = lo[active], hi[active], f_lo[active]
+    for _ in range(max_iter):
+        if not len(active):
+            break
+        f, slope = value_and_slope(r, cf[active])
+        same_side = np.sign(f) == np.sign(f_lo)
+        lo = np.where(same_side, r, lo)
+        f_lo = np.where(same_side, f, f_lo)
+        hi = np.where(same_side, hi, r)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = r - f / slope
+        inside = np.isfinite(newton) & (newton > np.minimum(lo, hi)) & (newton < np.maximum(lo, hi))
+        r_next = np.where(f == 0, r, np.where(inside, newton, (lo + hi) / 2))
+
+        done = np.abs(r_next - r) <= tol
+        result[active[done]] = r_next[done]
+        keep = ~done
+        active, r, lo, hi, f_lo = active[keep], r_next[keep], lo[keep], hi[keep], f_lo[keep]
+
+    result[active] = r
+    result = result.reshape(batch)
+    return result if result.ndim else float(result)
+
+
+def recovery_year(unpaid):
+    """Year after the last year (1..N) in which the investment is still unpaid.
+
+    `unpaid` is a boolean array over years 1..N on the last axis. Costs that
+    recur late in life (e.g. replacements) can put an investment back under
+    water after it first breaks even, so the payback is only reached once it
+    stays recovered. Returns NaN where year N itself is unpaid.
+    """
+    unpaid = np.asarray(unpaid, dtype=bool)
+    n = unpaid.shape[-1]
+    last_unpaid = np.where(unpaid.any(axis=-1), n - np.argmax(unpaid[..., ::-1], axis=-1), 0)
+    year = np.where(unpaid[..., -1], np.nan, last_unpaid + 1.0)
+    return year if year.ndim else float(year)
+
+
+def discounted_payback(rate, cash_flows):
+    """Year from which the discounted cumulative cash flow stays non-negative.
+
+    The search starts at year 1, so a fully financed system with no down
+    payment is not counted as paid back on day one. Returns NaN where the
+    investment is never recovered within the horizon.
+
+    >>> discounted_payback(0.0, [0.0, -50.0, 20.0, 20.0, 20.0])
+    4.0
+    """
+    cf = np.asarray(cash_flows, dtype=float)
+    cumulative = np.cumsum(cf * _discount_factors(rate, cf.shape[-1]), axis=-1)
+    return recovery_year(cumulative[..., 1:] < 0)
+
+
+def lcoe(net_cost, annual_generation_kwh, degradation_pct, rate,
+         om_per_year=0.0, years=PROJECTION_YEARS, yearly_costs=0.0):
+    """Levelised cost of energy in ₹/kWh over the projection horizon.
+
+    `yearly_costs` (shape (..., years)) covers running costs that vary by
+    year, such as component replacements. Systems that generate nothing
+    have no LCOE and return NaN.
+    """
+    t = np.arange(1, years + 1)
+    disc = _discount_factors(rate, years + 1)[..., 1:]
+    decay = (1 - np.asarray(degradation_pct, dtype=float)[..., None] / 100) ** (t - 1)
+    generation = np.asarray(annual_generation_kwh, dtype=float)[..., None] * decay
+    running = np.asarray(om_per_year, dtype=float)[..., None] + np.asarray(yearly_costs, dtype=float)
+    costs = np.asarray(net_cost, dtype=float) + (running * disc).sum(axis=-1)
+    energy = (generation * disc).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(energy > 0, costs / energy, np.nan)
+    return result if result.ndim else float(result)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Component lifecycle costs for the 25-year projection.
+
+Panels degrade slowly, but inverters and batteries wear out well before
+the panels do and the system needs routine O&M. This module schedules
+those replacements from component life and usage and returns per-year
+cost arrays that fold straight into the cost curves and cash flows.
+Like finance.py, every function broadcasts, so a portfolio of homes is
+priced in the same array operations as a single one.
+"""
+import numpy as np
+
+import finance
+
+# --- Component Assumptions ---
+INVERTER_LIFE_YEARS = 11        # string inverters typically last 10-12 years
+INVERTER_COST_PER_KW = 8000     # ₹ per kW of inverter capacity
+BATTERY_AH = 150
+BATTERY_VOLTAGE = 12
+BATTERY_DOD = 0.8
+BATTERY_COST = 14000            # ₹ per 150Ah 12V battery
+BATTERY_CYCLE_LIFE = 1500       # full cycles at 80% depth of discharge
+BATTERY_CALENDAR_LIFE = 6       # years, even when lightly cycled
+OM_COST_PER_KW = 500            # ₹ per kW per year (cleaning, inspection)
+OM_ESCALATION_PCT = 5.0
+
+
+def battery_life_years(num_batteries, daily_energy_kwh,
+                       cycle_life=BATTERY_CYCLE_LIFE, calendar_life=BATTERY_CALENDAR_LIFE):
+    """Years until the bank wears out, from cycle count or calendar ageing.
+
+    The bank is assumed to cycle the household's daily energy through its
+    usable capacity every day.
+    """
+    usable_kwh = np.asarray(num_batteries, dtype=float) * BATTERY_AH * BATTERY_VOLTAGE / 1000 * BATTERY_DOD
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cycles_per_year = 365 * np.asarray(daily_energy_kwh, dtype=float) / usable_kwh
+        cycle_years = np.where(cycles_per_year > 0, cycle_life / cycles_per_year, np.inf)
+    return np.minimum(cycle_years, calendar_life)
+
+
+def replacement_counts(life_years, years=finance.PROJECTION_YEARS):
+    """Replacements falling in each of years 1..N, shape (..., years).
+
+    A component with a life of L years is replaced whenever cumulative age
+    crosses a multiple of L. Nothing is replaced in the final year, since
+    the new part would not be used within the projection.
+    """
+    t = np.arange(1, years + 1)
+    life = np.asarray(life_years, dtype=float)[..., None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        counts = np.floor(t / life) - np.floor((t - 1) / life)
+    counts = np.where(np.isfinite(life) & (life > 0), counts, 0.0)
+    counts[..., -1] = 0.0
+    return counts
+
+
+def lifecycle_costs(required_kw, num_batteries=0, daily_energy_kwh=0.0,
+                    years=finance.PROJECTION_YEARS,
+                    inverter_life=INVERTER_LIFE_YEARS, om_escalation_pct=OM_ESCALATION_PCT):
+    """O&M plus inverter and battery replacement spend per year, shape (..., years)."""
+    kw = np.asarray(required_kw, dtype=float)[..., None]
+    t = np.arange(years)
+    om = OM_COST_PER_KW * kw * (1 + om_escalation_pct / 100) ** t
+    inverter = replacement_counts(inverter_life, years) * INVERTER_COST_PER_KW * kw
+    batteries = np.asarray(num_batteries, dtype=float)[..., None]
+    battery = (replacement_counts(battery_life_years(num_batteries, daily_energy_kwh), years)
+               * BATTERY_COST * batteries)
+    return om + inverter + battery
+
+
+def project_costs(install_cost, annual_units, grid_rate, inflation_pct, degradation_pct,
+                  running_costs=0.0, years=finance.PROJECTION_YEARS, offset_units=None):
+    """Lifecycle-aware grid vs solar cost projection.
+
+    The solar path pays the install cost up front, then each year's running
+    costs plus the grid bill for whatever degraded panels no longer cover.
+    `offset_units` is the consumption solar actually displaces in year one
+    (e.g. after net-metering banking); it defaults to all of `annual_units`.
+    Returns a dict of per-year arrays (grid, solar, savings and their
+    cumulative forms), the payback year (the year from which the solar path
+    stays at or below the grid path, NaN if not reached) and total savings
+    over the horizon.
+    """
+    t = np.arange(years)
+    grid = (np.asarray(annual_units, dtype=float) * np.asarray(grid_rate, dtype=float))[..., None] \
+        * (1 + np.asarray(inflation_pct, dtype=float)[..., None] / 100) ** t
+    if offset_units is None:
+        offset_units = annual_units
+    offset = finance.annual_savings(offset_units, grid_rate, inflation_pct, degradation_pct, years)
+    solar = np.asarray(running_costs, dtype=float) + grid - offset
+
+    cumulative_grid = np.cumsum(grid, axis=-1)
+    cumulative_solar = np.asarray(install_cost, dtype=float)[..., None] + np.cumsum(solar, axis=-1)
+    payback_year = finance.recovery_year(cumulative_solar > cumulative_grid)
+    return {
+        'grid': grid,
+        'solar': solar,
+        'savings': grid - solar,
+        'cumulative_grid': cumulative_grid,
+        'cumulative_solar': cumulative_solar,
+        'payback_year': payback_year,
+        'total_savings': cumulative_grid[..., -1] - cumulative_solar[..., -1],
+    }
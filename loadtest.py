@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""Concurrent-session load test for the Smart Solar Estimator.
+
+Each simulated user walks the whole wizard headlessly with Streamlit's
+AppTest: welcome -> mode select -> inputs -> results -> installer form.
+Sessions run on a thread pool inside each worker process. AppTest drives
+a single process-wide mock runtime, so reruns within one process are
+serialized the way a single Streamlit server queues them; lock wait is
+counted as latency. Use --processes to add genuinely parallel servers.
+
+    python loadtest.py --sessions 40 --threads 8 --processes 2
+    python loadtest.py --sessions 40 --save-baseline baseline.json
+    python loadtest.py --sessions 40 --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solar.py")
+STEPS = ["welcome", "mode_select", "inputs", "results", "installer"]
+MODES = ["Monthly Units Estimator", "Appliance-Based Estimator"]
+_RUN_LOCK = threading.Lock()
+
+
+# --- Memory Sampling ---
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        # ru_maxrss is KiB on Linux and bytes on macOS; it is a peak, not current
+        scale = 2**20 if sys.platform == "darwin" else 2**10
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._start_time = time.perf_counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.samples.append((time.perf_counter() - self._start_time, current_rss_mb()))
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.samples.append((time.perf_counter() - self._start_time, current_rss_mb()))
+
+
+# --- Session Walkthrough ---
+def walk_wizard(mode, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    timings = {}
+
+    def rerun():
+        with _RUN_LOCK:
+            at.run()
+
+    def timed(step, action):
+        start = time.perf_counter()
+        action()
+        timings[step] = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{mode} / {step}: {at.exception[0].value}")
+
+    timed("welcome", rerun)
+
+    def select_mode():
+        at.button(key="start_btn").click()
+        rerun()
+        at.radio(key="mode_selector").set_value(mode)
+        rerun()
+        at.button(key="step0_next").click()
+        rerun()
+    timed("mode_select", select_mode)
+
+    if mode == "Monthly Units Estimator":
+        def fill_inputs():
+            at.selectbox(key="monthly_city").set_value("Jaipur")
+            at.number_input(key="monthly_units").set_value(350.0)
+            at.number_input(key="monthly_area").set_value(40)
+            rerun()
+        next_key, installer_key = "monthly_next", "go_to_installer_monthly"
+    else:
+        def fill_inputs():
+            at.number_input(key="fan_count").set_value(3)
+            at.number_input(key="fan_hours").set_value(8.0)
+            at.number_input(key="bulb_count").set_value(6)
+            at.number_input(key="bulb_hours").set_value(5.0)
+            at.checkbox(key="fridge").check()
+            at.checkbox(key="router").check()
+            rerun()
+        next_key, installer_key = "appl_next", "appl_go_to_installer"
+    timed("inputs", fill_inputs)
+    def show_results():
+        at.button(key=next_key).click()
+        rerun()
+    timed("results", show_results)
+
+    def contact_installer():
+        at.button(key=installer_key).click()
+        rerun()
+        at.button(key="quote_0").click()
+        rerun()
+        name, phone, email = at.text_input[:3]
+        name.input("Load Test")
+        phone.input("9876543210")
+        email.input("loadtest@example.com")
+        next(b for b in at.button if b.label == "✅ Submit Request").click()
+        rerun()
+    timed("installer", contact_installer)
+    return timings
+
+
+def run_worker(sessions, threads, timeout, rss_interval, offset):
+    sampler = RssSampler(rss_interval)
+    sampler.start()
+    latencies = {step: [] for step in STEPS}
+    errors = []
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(walk_wizard, MODES[(offset + i) % len(MODES)], timeout)
+                   for i in range(sessions)]
+        for future in futures:
+            try:
+                for step, seconds in future.result().items():
+                    latencies[step].append(seconds)
+            except Exception as exc:
+                errors.append(str(exc))
+    elapsed = time.perf_counter() - start
+    sampler.stop()
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed,
+            "rss": sampler.samples}
+
+
+# --- Reporting ---
+def summarize(workers, wall_time):
+    summary = {"steps": {}, "rss": []}
+    for step in STEPS:
+        values = np.concatenate([w["latencies"][step] for w in workers]) * 1000
+        if not len(values):
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        summary["steps"][step] = {"p50_ms": round(p50, 1), "p95_ms": round(p95, 1),
+                                  "p99_ms": round(p99, 1), "count": int(len(values))}
+    summary["sessions"] = sum(len(w["latencies"]["installer"]) for w in workers)
+    summary["errors"] = [e for w in workers for e in w["errors"]]
+    summary["wall_time_s"] = round(wall_time, 2)
+    summary["throughput_sessions_per_s"] = round(summary["sessions"] / wall_time, 2) if wall_time else 0.0
+    for idx, w in enumerate(workers):
+        rss = np.array(w["rss"])
+        summary["rss"].append({"worker": idx, "start_mb": round(rss[0, 1], 1),
+                               "peak_mb": round(rss[:, 1].max(), 1), "end_mb": round(rss[-1, 1], 1),
+                               "growth_mb": round(rss[-1, 1] - rss[0, 1], 1),
+                               "timeline": [[round(t, 2), round(mb, 1)] for t, mb in rss]})
+    return summary
+
+
+def percent_change(now, before):
+    return f"{(now - before) / before * 100:+.1f}%" if before else "n/a"
+
+
+def print_report(summary, baseline=None):
+    print(f"Sessions completed: {summary['sessions']}  errors: {len(summary['errors'])}")
+    print(f"Wall time: {summary['wall_time_s']} s  throughput: {summary['throughput_sessions_per_s']} sessions/s")
+    print(f"{'step':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for step, stats in summary["steps"].items():
+        row = f"{step:<12}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+        if baseline and step in baseline["steps"]:
+            row += f"   p95 vs baseline: {percent_change(stats['p95_ms'], baseline['steps'][step]['p95_ms'])}"
+        print(row)
+    for w in summary["rss"]:
+        print(f"worker {w['worker']}: RSS {w['start_mb']} -> {w['end_mb']} MB "
+              f"(peak {w['peak_mb']} MB, growth {w['growth_mb']:+} MB)")
+    if baseline:
+        print("Throughput vs baseline: "
+              f"{percent_change(summary['throughput_sessions_per_s'], baseline['throughput_sessions_per_s'])}")
+    for err in summary["errors"][:5]:
+        print(f"error: {err}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Smart Solar Estimator wizard.")
+    parser.add_argument("--sessions", type=int, default=20, help="total simulated sessions")
+    parser.add_argument("--threads", type=int, default=4, help="concurrent sessions per process")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-rerun timeout (s)")
+    parser.add_argument("--rss-interval", type=float, default=0.5, help="RSS sampling period (s)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write this run's summary as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    args = parser.parse_args(argv)
+
+    shares = [args.sessions // args.processes + (i < args.sessions % args.processes)
+              for i in range(args.processes)]
+    offsets = [sum(shares[:i]) for i in range(args.processes)]
+    start = time.perf_counter()
+    if args.processes == 1:
+        workers = [run_worker(shares[0], args.threads, args.timeout, args.rss_interval, 0)]
+    else:
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            futures = [pool.submit(run_worker, n, args.threads, args.timeout, args.rss_interval, off)
+                       for n, off in zip(shares, offsets)]
+            workers = [f.result() for f in futures]
+    summary = summarize(workers, time.perf_counter() - start)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(summary, baseline)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
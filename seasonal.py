@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Twelve-month energy balance.
+
+Replaces the flat "x 30" and "/ 12" averages with monthly tables: each
+location gets a monthly insolation profile (monsoon dips included) and
+households get monthly consumption, either entered directly or derived
+from appliance use with cooling loads peaking in summer. Tables keep the
+month on the last axis, so a batch of homes is one (n, 12) array.
+"""
+import numpy as np
+
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+               "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Typical daily global horizontal irradiance (kWh/m²/day) by month; only the
+# shape is used, scaled so the annual mean matches the location's sun hours.
+CITY_MONTHLY_INSOLATION = {
+    "Delhi":     [4.0, 5.0, 6.0, 6.9, 7.2, 6.6, 5.5, 5.2, 5.5, 5.3, 4.4, 3.8],
+    "Mumbai":    [5.2, 5.9, 6.4, 6.8, 6.7, 4.6, 3.6, 3.8, 4.6, 5.3, 5.0, 4.9],
+    "Chennai":   [5.0, 6.0, 6.6, 6.7, 6.3, 5.6, 5.2, 5.3, 5.4, 4.6, 4.0, 4.2],
+    "Bangalore": [5.4, 6.1, 6.5, 6.4, 6.0, 4.9, 4.6, 4.8, 5.2, 4.9, 4.8, 4.9],
+    "Hyderabad": [5.1, 5.9, 6.4, 6.7, 6.7, 5.4, 4.7, 4.8, 5.1, 5.1, 4.9, 4.7],
+    "Ahmedabad": [4.7, 5.6, 6.4, 7.0, 7.1, 5.9, 4.5, 4.4, 5.3, 5.5, 4.8, 4.4],
+    "Kolkata":   [4.2, 4.9, 5.6, 6.0, 5.9, 4.6, 4.2, 4.3, 4.3, 4.4, 4.3, 4.0],
+    "Jaipur":    [4.4, 5.3, 6.2, 7.0, 7.3, 6.8, 5.6, 5.3, 5.8, 5.5, 4.7, 4.2],
+    "Lucknow":   [3.9, 4.9, 6.0, 6.8, 6.9, 6.1, 5.2, 5.0, 5.1, 5.0, 4.4, 3.7],
+}
+NATIONAL_MONTHLY_INSOLATION = np.mean(list(CITY_MONTHLY_INSOLATION.values()), axis=0)
+
+# Relative use of fans and AC through the year (annual mean of 1)
+COOLING_FACTOR = np.array([0.2, 0.4, 0.9, 1.4, 1.7, 1.6, 1.3, 1.2, 1.2, 1.0, 0.6, 0.3])
+COOLING_FACTOR = COOLING_FACTOR / COOLING_FACTOR.mean()
+
+
+def monthly_sun_hours(sun_hours, city=None):
+    """Peak sun hours per day for each month, shape (..., 12)."""
+    profile = np.asarray(CITY_MONTHLY_INSOLATION.get(city, NATIONAL_MONTHLY_INSOLATION), dtype=float)
+    weights = DAYS_IN_MONTH / DAYS_IN_MONTH.sum()
+    shape = profile / (profile * weights).sum()
+    return np.asarray(sun_hours, dtype=float)[..., None] * shape
+
+
+def monthly_generation_per_kw(sun_hours, city=None, monthly_shading_loss=0.0):
+    """kWh generated per installed kW in each month, shape (..., 12)."""
+    return monthly_sun_hours(sun_hours, city) * DAYS_IN_MONTH * (1 - np.asarray(monthly_shading_loss, dtype=float))
+
+
+def flat_monthly_consumption(monthly_kwh):
+    """Spread a single average monthly bill evenly across the year."""
+    return np.repeat(np.asarray(monthly_kwh, dtype=float)[..., None], 12, axis=-1)
+
+
+def appliance_monthly_consumption(base_daily_kwh, cooling_daily_kwh):
+    """Monthly kWh from year-round loads plus seasonal cooling loads.
+
+    `cooling_daily_kwh` is the year-average daily use of fans and AC; it is
+    redistributed by COOLING_FACTOR so summer months carry the peak.
+    """
+    base = np.asarray(base_daily_kwh, dtype=float)[..., None]
+    cooling = np.asarray(cooling_daily_kwh, dtype=float)[..., None] * COOLING_FACTOR
+    return (base + cooling) * DAYS_IN_MONTH
+
+
+def required_kw(consumption, generation_per_kw):
+    """System size whose annual output covers annual consumption."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.asarray(consumption, dtype=float).sum(axis=-1) / np.asarray(generation_per_kw, dtype=float).sum(axis=-1)
+
+
+def energy_balance(generation, consumption):
+    """Month-by-month surplus, deficit and net-metering bank.
+
+    Surplus units are banked with the utility and drawn down in later
+    deficit months of the same year. The bank follows the recursion
+    bank[m] = max(bank[m-1] + net[m], 0), evaluated in closed form as the
+    running net total minus its running minimum, so no loop over months
+    (or homes) is needed. Returns a dict of (..., 12) arrays plus the
+    yearly totals.
+    """
+    generation = np.asarray(generation, dtype=float)
+    consumption = np.asarray(consumption, dtype=float)
+    net = generation - consumption
+
+    running = np.cumsum(net, axis=-1)
+    floor = np.minimum(np.minimum.accumulate(running, axis=-1), 0.0)
+    bank = running - floor
+    bank_before = np.concatenate([np.zeros_like(bank[..., :1]), bank[..., :-1]], axis=-1)
+    grid_import = np.maximum(-(bank_before + net), 0.0)
+
+    return {
+        'generation': generation,
+        'consumption': consumption,
+        'surplus': np.maximum(net, 0.0),
+        'deficit': np.maximum(-net, 0.0),
+        'bank': bank,
+        'grid_import': grid_import,
+        'annual_grid_import': grid_import.sum(axis=-1),
+        'unused_bank': bank[..., -1],
+        'deficit_months': (net < 0).sum(axis=-1),
+    }
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Sun position and horizon-shading losses.
+
+The sun's azimuth and elevation are computed for every hour of a
+(non-leap) year in one array operation. A horizon profile - the elevation
+in degrees of obstructions such as buildings, trees or water tanks in
+equal azimuth bins clockwise from north, the first bin centred on north -
+masks the hours in which the direct beam is blocked. Losses are weighted
+by clear-sky beam irradiance, so a blocked low winter sun costs less than
+a blocked noon sun.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from seasonal import DAYS_IN_MONTH
+
+HOURS_IN_YEAR = 8760
+STANDARD_MERIDIAN = 82.5     # IST (UTC+5:30)
+DIFFUSE_FRACTION = 0.3       # share of irradiance that still arrives when the beam is blocked
+HORIZON_LABELS = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
+
+
+@lru_cache(maxsize=64)
+def sun_positions(latitude, longitude, standard_meridian=STANDARD_MERIDIAN):
+    """Hourly solar azimuth and elevation (degrees) plus clear-sky beam weight.
+
+    Returns (azimuth, elevation, beam, month) arrays of length 8760, sampled
+    at the middle of each clock hour. Azimuth is clockwise from north. The
+    arrays are cached per location and marked read-only.
+    """
+    hour_of_year = np.arange(HOURS_IN_YEAR)
+    day = hour_of_year // 24 + 1
+    clock = hour_of_year % 24 + 0.5
+
+    b = np.radians(360 * (day - 81) / 364)
+    equation_of_time = 9.87 * np.sin(2 * b) - 7.53 * np.cos(b) - 1.5 * np.sin(b)
+    solar_time = clock + (4 * (longitude - standard_meridian) + equation_of_time) / 60
+
+    hour_angle = np.radians(15 * (solar_time - 12))
+    declination = np.radians(23.45 * np.sin(np.radians(360 * (284 + day) / 365)))
+    lat = np.radians(latitude)
+
+    sin_elevation = (np.sin(lat) * np.sin(declination)
+                     + np.cos(lat) * np.cos(declination) * np.cos(hour_angle))
+    elevation = np.degrees(np.arcsin(np.clip(sin_elevation, -1, 1)))
+    azimuth = (np.degrees(np.arctan2(np.sin(hour_angle),
+                                     np.cos(hour_angle) * np.sin(lat) - np.tan(declination) * np.cos(lat)))
+               + 180) % 360
+
+    # Meinel clear-sky beam on a horizontal surface, zero below the horizon
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        air_mass = 1 / sin_elevation
+        beam = np.where(sin_elevation > 0, 1353 * 0.7 ** (air_mass ** 0.678) * sin_elevation, 0.0)
+
+    month = np.repeat(np.arange(12), DAYS_IN_MONTH * 24)
+    for arr in (azimuth, elevation, beam, month):
+        arr.setflags(write=False)
+    return azimuth, elevation, beam, month
+
+
+def shading_loss(latitude, longitude, horizon, diffuse_fraction=DIFFUSE_FRACTION):
+    """Fraction of annual and monthly irradiance lost to horizon obstructions.
+
+    `horizon` holds obstruction elevations (degrees) for equal azimuth bins
+    clockwise from north, the first bin centred on north. Returns
+    (annual_loss, monthly_loss) where monthly_loss has 12 entries.
+    """
+    horizon = np.asarray(horizon, dtype=float)
+    azimuth, elevation, beam, month = sun_positions(float(latitude), float(longitude))
+
+    width = 360 / len(horizon)
+    bins = ((azimuth + width / 2) // width).astype(int) % len(horizon)
+    blocked_beam = beam * (elevation < horizon[bins])
+
+    monthly_total = np.bincount(month, weights=beam, minlength=12)
+    monthly_blocked = np.bincount(month, weights=blocked_beam, minlength=12)
+    monthly_loss = (1 - diffuse_fraction) * monthly_blocked / monthly_total
+    annual_loss = (1 - diffuse_fraction) * monthly_blocked.sum() / monthly_total.sum()
+    return float(annual_loss), monthly_loss
@@ -10,6 +10,10 @@ import io
 from fpdf import FPDF
 import numpy as np
 import tempfile
+import finance
+import shading
+import lifecycle
+import seasonal
 
 # --- Session Initialization ---
 if 'step' not in st.session_state:
@@ -32,6 +36,10 @@ if 'show_contact_form' not in st.session_state:
     st.session_state.show_contact_form = False
 if 'calculation_done' not in st.session_state:
     st.session_state.calculation_done = False
+if 'shading_loss' not in st.session_state:
+    st.session_state.shading_loss = 0.0
+if 'monthly_shading_loss' not in st.session_state:
+    st.session_state.monthly_shading_loss = np.zeros(12)
 
 # --- Navigation Functions ---
 def next_step():
@@ -43,6 +51,128 @@ def prev_step():
     st.session_state.step -= 1
     st.rerun()
 
+# --- Shading ---
+def show_shading_inputs(key):
+    with st.expander("🌳 Shading from Nearby Obstructions"):
+        st.caption("How high do buildings, trees or water tanks rise above your roof in each direction? (angle in degrees, 0 = open sky)")
+        cols = st.columns(4)
+        horizon = [
+            cols[i % 4].number_input(f"{label} (°)", min_value=0.0, max_value=90.0, value=0.0, step=1.0, key=f"{key}_horizon_{label}")
+            for i, label in enumerate(shading.HORIZON_LABELS)
+        ]
+    latitude, longitude = city_coordinates.get(st.session_state.selected_city, default_coordinates)
+    annual_loss, monthly_loss = shading.shading_loss(latitude, longitude, horizon)
+    st.session_state.shading_loss = annual_loss
+    st.session_state.monthly_shading_loss = monthly_loss
+    if annual_loss:
+        st.caption(f"🌳 Estimated shading loss: {annual_loss * 100:.1f}% of annual sunlight (worst month: {monthly_loss.max() * 100:.1f}%)")
+
+# --- Monthly Energy Balance ---
+def show_monthly_balance():
+    balance = seasonal.energy_balance(np.array(st.session_state.monthly_generation), np.array(st.session_state.monthly_consumption))
+
+    st.markdown("---")
+    st.write("📆 Month-by-Month Energy Balance")
+    fig, ax = plt.subplots(facecolor='#0e1117')
+    ax.set_facecolor('#0e1117')
+    x = np.arange(12)
+    ax.bar(x - 0.2, balance['generation'], width=0.4, label="Solar Generation", color="#f1c40f")
+    ax.bar(x + 0.2, balance['consumption'], width=0.4, label="Consumption", color="#3498db")
+    ax.plot(x, balance['bank'], label="Banked Units", color="white", linestyle='--', marker='o')
+    ax.set_xticks(x, seasonal.MONTH_NAMES)
+    ax.set_ylabel("kWh", color="white")
+    ax.tick_params(colors='white')
+    ax.legend(facecolor='#0e1117', edgecolor='white', labelcolor='white')
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    plt.close(fig)
+    buf.seek(0)
+    st.image(buf, caption="Monthly Generation vs Consumption (with net-metering bank)")
+
+    st.dataframe(pd.DataFrame({
+        "Generation (kWh)": balance['generation'].round(1),
+        "Consumption (kWh)": balance['consumption'].round(1),
+        "Surplus (kWh)": balance['surplus'].round(1),
+        "Deficit (kWh)": balance['deficit'].round(1),
+        "Banked (kWh)": balance['bank'].round(1),
+        "Grid Import (kWh)": balance['grid_import'].round(1),
+    }, index=seasonal.MONTH_NAMES))
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Deficit Months", int(balance['deficit_months']))
+    col2.metric("Grid Import after Banking", f"{balance['annual_grid_import']:.0f} kWh/yr")
+    col3.metric("Unused Banked Units", f"{balance['unused_bank']:.0f} kWh")
+    return balance
+
+# --- System Cost & Component Lifecycle ---
+def show_cost_inputs(key):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        subsidy = st.number_input("🏛 Capital Subsidy (₹)", min_value=0.0, value=0.0, step=1000.0, key=f"{key}_subsidy")
+    with col2:
+        inverter_life = st.number_input("🔁 Inverter Life (years)", min_value=5, max_value=25, value=lifecycle.INVERTER_LIFE_YEARS, key=f"{key}_inverter_life")
+    with col3:
+        include_battery = st.checkbox(f"🔋 Include {st.session_state.num_150ah_batteries} x 150Ah battery bank", value=False, key=f"{key}_battery")
+
+    num_batteries = st.session_state.num_150ah_batteries if include_battery else 0
+    running_costs = lifecycle.lifecycle_costs(st.session_state.required_kw, num_batteries, st.session_state.daily_energy_kwh, inverter_life=inverter_life)
+    net_cost = float(finance.system_cost(st.session_state.required_kw, subsidy=subsidy)) + num_batteries * lifecycle.BATTERY_COST
+
+    note = f"🛠 Lifecycle costs over 25 years: ₹{int(running_costs.sum()):,} (O&M, inverter replaced every {inverter_life} years"
+    if num_batteries:
+        battery_life = float(lifecycle.battery_life_years(num_batteries, st.session_state.daily_energy_kwh))
+        note += f", batteries every {battery_life:.1f} years"
+    st.caption(note + ")")
+    return net_cost, running_costs
+
+# --- Financial Metrics ---
+def format_payback(years):
+    if not st.session_state.required_kw:
+        return "n/a"  # nothing installed, so nothing to pay back
+    if math.isnan(years):
+        return f"> {finance.PROJECTION_YEARS} years"
+    return f"{int(years)} year" if int(years) == 1 else f"{int(years)} years"
+
+def show_financials(key, offset_units, grid_rate, inflation_pct, degradation_pct, net_cost, running_costs=0.0):
+    st.subheader("💼 Financing & Returns")
+    col1, col2 = st.columns(2)
+    with col1:
+        discount_rate = st.number_input("📉 Discount Rate (%)", min_value=0.0, max_value=20.0, value=8.0, step=0.5, key=f"{key}_discount")
+    with col2:
+        loan_pct = st.number_input("🏦 Loan Share of Cost (%)", min_value=0.0, max_value=100.0, value=0.0, step=5.0, key=f"{key}_loan_pct")
+        interest_pct = st.number_input("💳 Loan Interest (%/yr)", min_value=0.0, max_value=20.0, value=9.0, step=0.25, key=f"{key}_interest")
+        tenure_years = st.number_input("🗓 Loan Tenure (years)", min_value=1, max_value=15, value=5, key=f"{key}_tenure")
+
+    principal = net_cost * loan_pct / 100
+    savings = finance.annual_savings(offset_units, grid_rate, inflation_pct, degradation_pct)
+    cash_flows = finance.project_cash_flows(net_cost, savings, loan_fraction=loan_pct / 100,
+                                            interest_pct=interest_pct, tenure_years=tenure_years,
+                                            yearly_costs=running_costs)
+    metrics = {
+        'net_cost': round(net_cost),
+        'npv': round(float(finance.npv(discount_rate / 100, cash_flows))),
+        'irr': finance.irr(cash_flows),
+        'discounted_payback': finance.discounted_payback(discount_rate / 100, cash_flows),
+        'lcoe': round(finance.lcoe(net_cost, sum(st.session_state.monthly_generation), degradation_pct, discount_rate / 100, yearly_costs=running_costs), 2),
+        'emi': round(float(finance.emi(principal, interest_pct, tenure_years))) if principal else 0,
+        'loan_interest': round(float(finance.total_interest(principal, interest_pct, tenure_years))) if principal else 0,
+    }
+    metrics['irr_text'] = "n/a" if math.isnan(metrics['irr']) else f"{metrics['irr'] * 100:.1f}%"
+    metrics['discounted_payback_text'] = format_payback(metrics['discounted_payback'])
+    metrics['lcoe_text'] = "n/a" if math.isnan(metrics['lcoe']) else f"₹{metrics['lcoe']}/kWh"
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Net Cost after Subsidy", f"₹{metrics['net_cost']:,}")
+    col2.metric("NPV (25 yrs)", f"₹{metrics['npv']:,}")
+    col3.metric("IRR", metrics['irr_text'])
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Discounted Payback", metrics['discounted_payback_text'])
+    col2.metric("LCOE", metrics['lcoe_text'])
+    col3.metric("Monthly EMI", f"₹{metrics['emi']:,}")
+    if principal:
+        st.caption(f"Loan of ₹{round(principal):,} over {tenure_years} years — total interest ₹{metrics['loan_interest']:,}")
+    return metrics
+
 # --- Welcome Screen ---
 if not st.session_state.start:
     st.set_page_config(page_title="Smart Solar Advisor", page_icon="🌞")
@@ -67,6 +197,14 @@ city_sun_hours = {
     "Custom (Enter manually)": None
 }
 
+# --- City Coordinates (latitude, longitude) for Sun Position ---
+city_coordinates = {
+    "Delhi": (28.61, 77.21), "Mumbai": (19.08, 72.88), "Chennai": (13.08, 80.27),
+    "Bangalore": (12.97, 77.59), "Hyderabad": (17.39, 78.49), "Ahmedabad": (23.02, 72.57),
+    "Kolkata": (22.57, 88.36), "Jaipur": (26.91, 75.79), "Lucknow": (26.85, 80.95)
+}
+default_coordinates = (22.0, 79.0)  # central India, used for custom/unknown locations
+
 # --- Step 0: Mode Selection ---
 if st.session_state.step == 0:
     st.subheader("Step 1: Choose Estimation Mode")
@@ -111,6 +249,15 @@ elif st.session_state.step == 1 and st.session_state.mode == "Monthly Units Esti
             "Available installation area (sq. meters):",
             min_value=1, key="monthly_area"
         )
+        monthly_breakdown = st.checkbox("📆 Enter month-by-month usage (from your bills)", key="monthly_breakdown")
+        if monthly_breakdown:
+            cols = st.columns(4)
+            monthly_usage = [
+                cols[i % 4].number_input(f"{name} (kWh)", min_value=0.0, value=monthly_units_input, key=f"monthly_usage_{name}")
+                for i, name in enumerate(seasonal.MONTH_NAMES)
+            ]
+
+    show_shading_inputs("monthly")
 
     col1, col2 = st.columns(2)
     with col1:
@@ -118,16 +265,23 @@ elif st.session_state.step == 1 and st.session_state.mode == "Monthly Units Esti
     with col2:
         if st.button("Next ➡", key="monthly_next"):
             # Perform calculations
-            solar_output_per_kw = round(st.session_state.sun_hours * 365, 1)
-            area_per_kw = 10
-            cost_per_kw = 50000
-            
-            daily_energy_kwh = round(monthly_units_input / 30, 2)
-            required_kw = round(monthly_units_input / (solar_output_per_kw / 12), 2)
+            area_per_kw = finance.AREA_PER_KW
+            cost_per_kw = finance.COST_PER_KW
+
+            if monthly_breakdown:
+                monthly_consumption = np.array(monthly_usage)
+            else:
+                monthly_consumption = seasonal.flat_monthly_consumption(monthly_units_input)
+            generation_per_kw = seasonal.monthly_generation_per_kw(
+                st.session_state.sun_hours, st.session_state.selected_city, st.session_state.monthly_shading_loss
+            )
+
+            monthly_units_input = round(float(monthly_consumption.mean()), 2)
+            daily_energy_kwh = round(float(monthly_consumption.sum()) / 365, 2)
+            required_kw = round(float(seasonal.required_kw(monthly_consumption, generation_per_kw)), 2)
             area_needed = round(required_kw * area_per_kw, 2)
             cost_estimate = round(required_kw * cost_per_kw)
             monthly_grid_cost = round(monthly_units_input * unit_rate)
-            payback_years = round(cost_estimate / (monthly_grid_cost * 12), 1)
             usable_battery_kwh = round(daily_energy_kwh / 0.8, 2)
             battery_capacity_ah = round((usable_battery_kwh * 1000) / 12, 0)
             num_150ah_batteries = math.ceil(battery_capacity_ah / 150)
@@ -135,11 +289,12 @@ elif st.session_state.step == 1 and st.session_state.mode == "Monthly Units Esti
             # Store results
             st.session_state.update({
                 'monthly_energy_used': monthly_units_input,
+                'monthly_consumption': monthly_consumption.round(2).tolist(),
+                'monthly_generation': (generation_per_kw * required_kw).round(2).tolist(),
                 'required_kw': required_kw,
                 'area_needed': area_needed,
                 'cost_estimate': cost_estimate,
                 'monthly_grid_cost': monthly_grid_cost,
-                'payback_years': payback_years,
                 'usable_battery_kwh': usable_battery_kwh,
                 'num_150ah_batteries': num_150ah_batteries,
                 'daily_energy_kwh': daily_energy_kwh,
@@ -165,9 +320,12 @@ elif st.session_state.step == 2 and st.session_state.mode == "Monthly Units Esti
         # Display results
         st.success(f"📅 Monthly Energy Used: {st.session_state.monthly_energy_used} kWh")
         st.write(f"⚡ Suggested Solar Panel Size: {st.session_state.required_kw} kW")
+        st.write(f"🌳 Shading Loss: {st.session_state.shading_loss * 100:.1f}%")
         st.write(f"🌍 Area Needed: {st.session_state.area_needed} sq. meters")
         st.write(f"💸 Estimated Solar Cost: ₹{st.session_state.cost_estimate}")
 
+        balance = show_monthly_balance()
+
         st.markdown("---")
         st.write("Battery Backup Suggestion")
         st.write(f"🔌 Daily backup energy needed: {st.session_state.daily_energy_kwh} kWh")
@@ -176,7 +334,7 @@ elif st.session_state.step == 2 and st.session_state.mode == "Monthly Units Esti
 
         st.metric("Monthly Grid Bill", f"₹{st.session_state.monthly_grid_cost}")
         st.metric("💰 Monthly Savings", f"₹{st.session_state.monthly_grid_cost}")
-        st.metric("⏳ Payback Period", f"{st.session_state.payback_years} years")
+        payback_metric = st.empty()  # filled in once the lifecycle projection is known
 
         # Chart Section
         st.subheader("📈 Grid vs Solar Cost Over Time")
@@ -198,38 +356,24 @@ elif st.session_state.step == 2 and st.session_state.mode == "Monthly Units Esti
                 min_value=0.0, max_value=2.0, value=0.5, step=0.1
             )
 
-        # Calculate cost over 25 years
-        years = np.arange(1, 26)
-        monthly_units = st.session_state.get("monthly_energy_kwh", 0)
-        total_annual_units = monthly_units * 12
-
-        # Grid cost projection with inflation
-        grid_costs = [total_annual_units * user_grid_rate * ((1 + user_grid_inflation / 100) ** (year - 1)) for year in years]
-        cumulative_grid_costs = np.cumsum(grid_costs)
-
-        # Solar cost projection
-        est_kw = st.session_state.get("required_kw", 0)
-        solar_install_cost = est_kw * 75000  # Approx ₹75,000 per kW
-        cumulative_solar_costs = []
-        solar_generation = total_annual_units
-
-        for year in years:
-            if year == 1:
-                cumulative_solar_costs.append(solar_install_cost)
-            else:
-                degradation = (1 - user_solar_degradation / 100) ** (year - 1)
-                yearly_offset = solar_generation * degradation * user_grid_rate * ((1 + user_grid_inflation / 100) ** (year - 1))
-                net_cost = cumulative_solar_costs[-1] - yearly_offset
-                cumulative_solar_costs.append(max(net_cost, 0))
+        # Lifecycle-aware cost projection over 25 years
+        years = np.arange(1, finance.PROJECTION_YEARS + 1)
+        total_annual_units = st.session_state.get("monthly_energy_used", 0) * 12
+        offset_units = total_annual_units - float(balance['annual_grid_import'])
+        net_cost, running_costs = show_cost_inputs("monthly")
+        projection = lifecycle.project_costs(
+            net_cost, total_annual_units, user_grid_rate,
+            user_grid_inflation, user_solar_degradation, running_costs,
+            offset_units=offset_units
+        )
+        cumulative_grid_costs = projection['cumulative_grid']
+        cumulative_solar_costs = projection['cumulative_solar']
 
         # Find Payback Year
-        payback_year = None
-        for i in range(len(years)):
-            if cumulative_solar_costs[i] < cumulative_grid_costs[i]:
-                payback_year = years[i]
-                break
-
-        total_savings = cumulative_grid_costs[-1] - cumulative_solar_costs[-1]
+        payback_year = None if math.isnan(projection['payback_year']) else int(projection['payback_year'])
+        payback_text = format_payback(projection['payback_year'])
+        payback_metric.metric("⏳ Payback Period", payback_text)
+        total_savings = projection['total_savings']
 
         # Plot
         fig, ax = plt.subplots(facecolor='#0e1117')
@@ -257,11 +401,15 @@ elif st.session_state.step == 2 and st.session_state.mode == "Monthly Units Esti
         st.image(buf, caption="Cost Comparison: Grid vs Solar (25 Years)")
         st.session_state['cost_comparison_chart'] = buf
 
+        financials = show_financials("monthly", offset_units, user_grid_rate, user_grid_inflation, user_solar_degradation,
+                                     net_cost, running_costs=running_costs)
+
         # Report generation
         report_txt = f"""Smart Solar System Estimation Report
 -----------------------------------
    Location: {st.session_state.selected_city}
    Sun Hours: {st.session_state.sun_hours} hours/day
+   Shading Loss: {st.session_state.shading_loss * 100:.1f}%
 
    Monthly Bill: ₹ {st.session_state.monthly_grid_cost}
    Electricity Rate: ₹ {st.session_state.unit_rate}/unit
@@ -269,23 +417,42 @@ elif st.session_state.step == 2 and st.session_state.mode == "Monthly Units Esti
    Suggested Solar Size: {st.session_state.required_kw} kW
    Area Needed: {st.session_state.area_needed} sq. meters
    Estimated Cost: ₹ {st.session_state.cost_estimate}
+   Deficit Months: {int(balance['deficit_months'])} / 12
+   Grid Import after Banking: {balance['annual_grid_import']:.0f} kWh/yr
 
   Monthly Savings: ₹ {st.session_state.monthly_grid_cost}
-  Payback Period: {st.session_state.payback_years} years
+  Payback Period (incl. replacements & O&M): {payback_text}
+  25-Year Savings (after replacements & O&M): ₹ {int(total_savings)}
+
+  Net Cost after Subsidy: ₹ {financials['net_cost']}
+  NPV (25 yrs): ₹ {financials['npv']}
+  IRR: {financials['irr_text']}
+  Discounted Payback: {financials['discounted_payback_text']}
+  LCOE: {financials['lcoe_text']}
+  Monthly EMI: ₹ {financials['emi']}
   """
 
         # CSV Report
         df = pd.DataFrame({
             "Location": [st.session_state.selected_city],
             "Sun Hours": [st.session_state.sun_hours],
+            "Shading Loss (%)": [round(st.session_state.shading_loss * 100, 1)],
             "Monthly Bill (₹)": [st.session_state.monthly_grid_cost],
             "Rate (₹/unit)": [st.session_state.unit_rate],
             "Yearly Units": [st.session_state.monthly_energy_used * 12],
             "Suggested kW": [st.session_state.required_kw],
             "Area (sqm)": [st.session_state.area_needed],
             "Cost (₹)": [st.session_state.cost_estimate],
+            "Deficit Months": [int(balance['deficit_months'])],
+            "Grid Import after Banking (kWh/yr)": [round(float(balance['annual_grid_import']))],
             "Savings (₹/month)": [st.session_state.monthly_grid_cost],
-            "Payback (yrs)": [st.session_state.payback_years]
+            "Payback (yrs)": [payback_year or "> 25"],
+            "Net Cost (₹)": [financials['net_cost']],
+            "NPV (₹)": [financials['npv']],
+            "IRR": [financials['irr_text']],
+            "Discounted Payback": [financials['discounted_payback_text']],
+            "LCOE (₹/kWh)": [financials['lcoe']],
+            "EMI (₹/month)": [financials['emi']]
         })
 
         col1, col2 = st.columns(2)
@@ -436,6 +603,8 @@ elif st.session_state.step == 1 and st.session_state.mode == "Appliance-Based Es
             "area_avail": area_avail
         }
 
+    show_shading_inputs("appl")
+
     col1, col2 = st.columns(2)
     with col1:
         st.button("⬅ Back", on_click=prev_step, key="appl_back")
@@ -443,8 +612,8 @@ elif st.session_state.step == 1 and st.session_state.mode == "Appliance-Based Es
         if st.button("Next ➡", key="appl_next"):
             # Perform calculations
             inputs = st.session_state.appliance_inputs
-            cost_per_kw = 50000
-            area_per_kw = 10
+            cost_per_kw = finance.COST_PER_KW
+            area_per_kw = finance.AREA_PER_KW
 
             daily_energy_wh = (
                 inputs["fan_count"] * 75 * inputs["fan_hours"] +
@@ -460,13 +629,23 @@ elif st.session_state.step == 1 and st.session_state.mode == "Appliance-Based Es
                 (1200 * inputs["oven_hours"] / 60 if inputs["oven"] else 0)
             )
 
+            cooling_energy_wh = (
+                inputs["fan_count"] * 75 * inputs["fan_hours"] +
+                (1500 * inputs["ac_hours"] if inputs["ac"] else 0)
+            )
+
             daily_energy_kwh = daily_energy_wh / 1000
-            monthly_energy_kwh = round(daily_energy_kwh * 30, 2)
-            required_kw = round(monthly_energy_kwh / (st.session_state.sun_hours * 30), 2)
+            monthly_consumption = seasonal.appliance_monthly_consumption(
+                (daily_energy_wh - cooling_energy_wh) / 1000, cooling_energy_wh / 1000
+            )
+            generation_per_kw = seasonal.monthly_generation_per_kw(
+                st.session_state.sun_hours, st.session_state.selected_city, st.session_state.monthly_shading_loss
+            )
+            monthly_energy_kwh = round(float(monthly_consumption.mean()), 2)
+            required_kw = round(float(seasonal.required_kw(monthly_consumption, generation_per_kw)), 2)
             area_needed = round(required_kw * area_per_kw, 2)
             cost_estimate = round(required_kw * cost_per_kw)
             monthly_grid_cost = round(monthly_energy_kwh * inputs["user_unit_rate"])
-            payback_years = round(cost_estimate / (monthly_grid_cost * 12), 1)
             usable_battery_kwh = round(daily_energy_kwh / 0.8, 2)
             battery_capacity_ah = round((usable_battery_kwh * 1000) / 12, 0)
             num_150ah_batteries = math.ceil(battery_capacity_ah / 150)
@@ -474,11 +653,12 @@ elif st.session_state.step == 1 and st.session_state.mode == "Appliance-Based Es
             # Store results
             st.session_state.update({
                 'monthly_energy_kwh': monthly_energy_kwh,
+                'monthly_consumption': monthly_consumption.round(2).tolist(),
+                'monthly_generation': (generation_per_kw * required_kw).round(2).tolist(),
                 'required_kw': required_kw,
                 'area_needed': area_needed,
                 'cost_estimate': cost_estimate,
                 'monthly_grid_cost': monthly_grid_cost,
-                'payback_years': payback_years,
                 'usable_battery_kwh': usable_battery_kwh,
                 'num_150ah_batteries': num_150ah_batteries,
                 'daily_energy_kwh': daily_energy_kwh,
@@ -504,9 +684,12 @@ elif st.session_state.step == 2 and st.session_state.mode == "Appliance-Based Es
         st.subheader("Step 3: Your Estimation Results")
         st.success(f"📅 Monthly Energy Required: {st.session_state.monthly_energy_kwh} kWh")
         st.write(f"⚡ Suggested Solar Panel Size: {st.session_state.required_kw} kW")
+        st.write(f"🌳 Shading Loss: {st.session_state.shading_loss * 100:.1f}%")
         st.write(f"🌍 Area Needed: {st.session_state.area_needed} sq. meters")
         st.write(f"💸 Estimated Solar Cost: ₹{st.session_state.cost_estimate}")
 
+        balance = show_monthly_balance()
+
         st.markdown("---")
         st.write("🔋 Battery Backup Suggestion")
         st.write(f"🔌 Daily backup energy needed: {st.session_state.daily_energy_kwh:.2f} kWh")
@@ -515,7 +698,7 @@ elif st.session_state.step == 2 and st.session_state.mode == "Appliance-Based Es
 
         st.metric("Monthly Grid Bill", f"₹{st.session_state.monthly_grid_cost}")
         st.metric("💰 Monthly Savings", f"₹{st.session_state.monthly_grid_cost}")
-        st.metric("⏳ Payback Period", f"{st.session_state.payback_years} years")
+        payback_metric = st.empty()  # filled in once the lifecycle projection is known
 
         st.subheader("📈 Grid vs Solar Cost Over Time")
 
@@ -542,26 +725,22 @@ elif st.session_state.step == 2 and st.session_state.mode == "Appliance-Based Es
 
         # Data generation
         if st.session_state.get("calculation_done"):
-             years = list(range(1, 26))
-             solar_costs, grid_costs = [], []
-             initial_units = st.session_state.appliance_energy_used * 12
-             solar_units = initial_units
-             grid_rate = appliance_grid_rate
-
-             for year in years:
-                solar_cost = solar_units * appliance_grid_rate
-                grid_cost = initial_units * grid_rate
-
-                solar_costs.append(solar_cost)
-                grid_costs.append(grid_cost)
-
-                solar_units *= (1 - appliance_degradation / 100)
-                grid_rate *= (1 + appliance_inflation / 100)
-
-                savings = [g - s for g, s in zip(grid_costs, solar_costs)]
-                cumulative_savings = [sum(savings[:i + 1]) for i in range(len(savings))]
-
-             payback_year = next((i + 1 for i, val in enumerate(cumulative_savings) if val >= st.session_state.cost_estimate), 25)
+             years = np.arange(1, finance.PROJECTION_YEARS + 1)
+             net_cost, running_costs = show_cost_inputs("appl")
+             annual_units = st.session_state.appliance_energy_used * 12
+             offset_units = annual_units - float(balance['annual_grid_import'])
+             projection = lifecycle.project_costs(
+                 net_cost, annual_units,
+                 appliance_grid_rate, appliance_inflation, appliance_degradation, running_costs,
+                 offset_units=offset_units
+             )
+             grid_costs = projection['grid']
+             solar_costs = projection['solar']
+             savings = projection['savings']
+
+             payback_year = None if math.isnan(projection['payback_year']) else int(projection['payback_year'])
+             payback_text = format_payback(projection['payback_year'])
+             payback_metric.metric("⏳ Payback Period", payback_text)
              st.session_state.payback_years_appliance = payback_year
 
              # Chart plotting
@@ -569,7 +748,8 @@ elif st.session_state.step == 2 and st.session_state.mode == "Appliance-Based Es
              ax.plot(years, grid_costs, label='Grid Cost (₹)', color='red', linewidth=2)
              ax.plot(years, solar_costs, label='Solar Cost (₹)', color='green', linewidth=2)
              ax.fill_between(years, savings, color='yellow', alpha=0.2, label='Savings')
-             ax.axvline(payback_year, color='cyan', linestyle='--', label=f'Payback Year: {payback_year}')
+             if payback_year:
+                 ax.axvline(payback_year, color='cyan', linestyle='--', label=f'Payback Year: {payback_year}')
 
              ax.set_xlabel("Years", color='white')
              ax.set_ylabel("₹ Cost", color='white')
@@ -588,11 +768,15 @@ elif st.session_state.step == 2 and st.session_state.mode == "Appliance-Based Es
              st.image(buf, use_column_width=True)
              st.session_state['cost_comparison_chart_appliance'] = buf
 
+        financials = show_financials("appl", offset_units, appliance_grid_rate, appliance_inflation, appliance_degradation,
+                                     net_cost, running_costs=running_costs)
+
         # Report generation
         report_txt = f"""Smart Solar System Estimation Report
 -----------------------------------
    Location: {st.session_state.selected_city}
    Sun Hours: {st.session_state.sun_hours} hours/day
+   Shading Loss: {st.session_state.shading_loss * 100:.1f}%
    Household Type: {st.session_state.preset}
 
    Appliance-Based Energy Use:
@@ -600,6 +784,8 @@ elif st.session_state.step == 2 and st.session_state.mode == "Appliance-Based Es
    - Required Solar Size: {st.session_state.required_kw} kW
    - Required Area: {st.session_state.area_needed} sq. meters
    - Estimated Solar Cost: ₹{st.session_state.cost_estimate}
+   - Deficit Months: {int(balance['deficit_months'])} / 12
+   - Grid Import after Banking: {balance['annual_grid_import']:.0f} kWh/yr
 
    Battery Backup Suggestion:
    - Daily Usage: {st.session_state.daily_energy_kwh:.2f} kWh
@@ -609,23 +795,39 @@ elif st.session_state.step == 2 and st.session_state.mode == "Appliance-Based Es
    Financials:
    - Monthly Grid Cost: ₹{st.session_state.monthly_grid_cost}
    - Monthly Savings: ₹{st.session_state.monthly_grid_cost}
-   - Payback Period: {st.session_state.payback_years} years
+   - Payback Period (incl. replacements & O&M): {payback_text}
+   - 25-Year Savings (after replacements & O&M): ₹{int(projection['total_savings'])}
+   - Net Cost after Subsidy: ₹{financials['net_cost']}
+   - NPV (25 yrs): ₹{financials['npv']}
+   - IRR: {financials['irr_text']}
+   - Discounted Payback: {financials['discounted_payback_text']}
+   - LCOE: {financials['lcoe_text']}
+   - Monthly EMI: ₹{financials['emi']}
    """
 
         # CSV Report
         df = pd.DataFrame({
             "Location": [st.session_state.selected_city],
             "Sun Hours": [st.session_state.sun_hours],
+            "Shading Loss (%)": [round(st.session_state.shading_loss * 100, 1)],
             "Preset": [st.session_state.preset],
             "Monthly Usage (kWh)": [st.session_state.monthly_energy_kwh],
             "Required kW": [st.session_state.required_kw],
             "Required Area (sqm)": [st.session_state.area_needed],
             "Solar Cost (₹)": [st.session_state.cost_estimate],
+            "Deficit Months": [int(balance['deficit_months'])],
+            "Grid Import after Banking (kWh/yr)": [round(float(balance['annual_grid_import']))],
             "Battery Daily kWh": [st.session_state.daily_energy_kwh],
             "Usable Battery (kWh)": [st.session_state.usable_battery_kwh],
             "150Ah Batteries": [st.session_state.num_150ah_batteries],
             "Monthly Grid Bill (₹)": [st.session_state.monthly_grid_cost],
-            "Payback (yrs)": [st.session_state.payback_years]
+            "Payback (yrs)": [payback_year or "> 25"],
+            "Net Cost (₹)": [financials['net_cost']],
+            "NPV (₹)": [financials['npv']],
+            "IRR": [financials['irr_text']],
+            "Discounted Payback": [financials['discounted_payback_text']],
+            "LCOE (₹/kWh)": [financials['lcoe']],
+            "EMI (₹/month)": [financials['emi']]
         })
 
         col1, col2 = st.columns(2)